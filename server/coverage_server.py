@@ -19,19 +19,23 @@ Environment Variables:
     COVERAGE_PORT - Port for coverage HTTP server (default: 9095)
     COVERAGE_PROCESS_START - Path to .coveragerc (set automatically)
     COVERAGE_DATA_DIR - Directory for coverage files (default: /dev/shm)
+    COVERAGE_HTTP_THREADS - Request handler threads (default: 4)
+    COVERAGE_LOG_LEVEL - Wrapper log level; DEBUG logs every request (default: INFO)
 """
 
 import os
 import sys
-import runpy
+import logging
+import queue
+import re
+import threading
+import signal
+import time
 import json
 import base64
-import glob
 import urllib.parse
 from datetime import datetime, timezone
-from threading import Thread
 from http.server import HTTPServer, BaseHTTPRequestHandler
-from socketserver import ThreadingMixIn
 import coverage
 
 # Configuration
@@ -39,109 +43,285 @@ COVERAGE_PORT = int(os.getenv("COVERAGE_PORT", "9095"))
 # Default to /dev/shm (Linux containers) or /tmp/coverage-test (macOS)
 _DEFAULT_DIR = "/dev/shm" if os.path.exists("/dev/shm") else "/tmp/coverage-test"
 COVERAGE_DATA_DIR = os.getenv("COVERAGE_DATA_DIR", _DEFAULT_DIR)
+COVERAGE_HTTP_THREADS = int(os.getenv("COVERAGE_HTTP_THREADS", "4"))
+COVERAGE_LOG_LEVEL = os.getenv("COVERAGE_LOG_LEVEL", "INFO").upper()
 PRINT_PREFIX = "[coverage-wrapper]"
+# Raw bytes base64-encoded per write when streaming /coverage (multiple of 3)
+B64_CHUNK_SIZE = 48 * 1024
+
+logger = logging.getLogger("coverage-wrapper")
 
 # Path to the .coveragerc file (relative to this script)
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 DEFAULT_COVERAGERC = os.path.join(SCRIPT_DIR, ".coveragerc")
 
 
+# (epoch second, formatted "YYYY-MM-DDTHH:MM:SS") of the last timestamp
+_timestamp_cache = (None, "")
+
+
+def utc_timestamp():
+    """Return the current UTC time as ISO 8601 with microseconds and +00:00.
+
+    Only the sub-second part is formatted per call; the date/time prefix is
+    reused while scrapes land within the same second.
+    """
+    global _timestamp_cache
+
+    sec, micros = divmod(time.time_ns() // 1000, 1_000_000)
+    cached_sec, prefix = _timestamp_cache
+    if sec != cached_sec:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _timestamp_cache = (sec, prefix)
+    return f"{prefix}.{micros:06d}+00:00"
+
+
+def find_coverage_files():
+    """Return paths of all .coverage* files in COVERAGE_DATA_DIR (unordered).
+
+    Uses a single os.scandir() pass instead of glob, which avoids the
+    fnmatch machinery and an extra stat per entry on every request.
+    """
+    try:
+        with os.scandir(COVERAGE_DATA_DIR) as entries:
+            return [
+                entry.path for entry in entries
+                if entry.name.startswith(".coverage") and entry.is_file()
+            ]
+    except OSError:
+        # Missing, unreadable or not a directory: same as glob, no files
+        return []
+
+
+# (key, serialized bytes) of the last combine; replaced atomically as a tuple
+_combined_cache = (None, b"")
+
+
+def filter_coverage_data(data, exclude):
+    """Return a copy of `data` without files whose path contains any of `exclude`.
+
+    Lines/arcs are copied one measurement context at a time, so dynamic
+    contexts (e.g. per-test labels) survive the filtering.
+    """
+    measured = data.measured_files()
+    keep = [f for f in measured if not any(p in f for p in exclude)]
+    if len(keep) == len(measured):
+        return data  # nothing excluded; skip the per-context copy
+
+    filtered = coverage.CoverageData(no_disk=True)
+    add = filtered.add_arcs if data.has_arcs() else filtered.add_lines
+    get = data.arcs if data.has_arcs() else data.lines
+
+    for context in sorted(data.measured_contexts()):
+        data.set_query_contexts(["^" + re.escape(context) + "$"])
+        filtered.set_context(context)
+        add({f: found for f in keep if (found := get(f))})
+    data.set_query_contexts(None)
+
+    # Files that were measured but have no lines/arcs in any context. This
+    # call also runs when `keep` is empty, so an all-excluded result still
+    # records arc mode instead of defaulting to lines.
+    copied = filtered.measured_files()
+    filtered.set_context(None)
+    add({f: [] for f in keep if f not in copied})
+    filtered.add_file_tracers({f: tracer for f in keep if (tracer := data.file_tracer(f))})
+
+    return filtered
+
+
+def combine_coverage_files(coverage_files, exclude=()):
+    """Combine coverage files in memory and return CoverageData.dumps() bytes.
+
+    Measured files whose path contains any substring in `exclude` are dropped
+    before serializing. The result is cached on `exclude` and the
+    (path, mtime, size) of every input file, so repeated scrapes between
+    worker saves don't re-read every SQLite file.
+    """
+    global _combined_cache
+
+    try:
+        key = (tuple(exclude), tuple(sorted(
+            (path, st.st_mtime_ns, st.st_size)
+            for path, st in ((path, os.stat(path)) for path in coverage_files)
+        )))
+    except OSError:
+        key = None  # a file vanished mid-scan; don't cache this result
+
+    cached_key, cached_bytes = _combined_cache
+    if key is not None and key == cached_key:
+        logger.debug("Reusing combined data for %d unchanged file(s)", len(coverage_files))
+        return cached_bytes
+
+    # Create a combined coverage data object (in-memory, no writes)
+    combined = coverage.CoverageData(no_disk=True)
+
+    for cov_file in coverage_files:
+        try:
+            # Read each coverage file from disk (no_disk=False required for reading!)
+            file_data = coverage.CoverageData(basename=cov_file)
+            file_data.read()
+            combined.update(file_data)
+            measured = list(file_data.measured_files())
+            logger.debug("Combined: %s (%d files)", os.path.basename(cov_file), len(measured))
+        except Exception as e:
+            logger.warning("Error reading %s: %s", cov_file, e)
+            key = None  # partial result (e.g. file locked); retry next scrape
+
+    if exclude:
+        combined = filter_coverage_data(combined, exclude)
+
+    # Serialize to binary
+    json_bytes = combined.dumps()
+    if key is not None:
+        _combined_cache = (key, json_bytes)
+    return json_bytes
+
+
 class CoverageHandler(BaseHTTPRequestHandler):
     """HTTP handler for coverage endpoints."""
 
+    # Keep connections open between scrapes (every response has a
+    # Content-Length). An idle keep-alive connection pins a pool thread, so
+    # it is only kept when another thread stays free, and the wait for the
+    # next request is short; writing a large dump gets more time.
+    protocol_version = "HTTP/1.1"
+    timeout = 1
+    send_timeout = 30
+
+    # Buffer wfile so status line, headers and body go out in as few
+    # send() calls as possible instead of one per header/write.
+    wbufsize = 64 * 1024
+
     def log_message(self, format, *args):
         """Suppress default request logging"""
         pass
 
-    def do_GET(self):
-        parsed = urllib.parse.urlparse(self.path)
-        path = parsed.path
-        query = urllib.parse.parse_qs(parsed.query)
-        label = query.get("name", ["session"])[0]
+    def _send_headers(self, status, content_type, content_length, headers=None):
+        self.response_started = True
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(content_length))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        # Decide before the headers go out, so the client knows not to reuse
+        # the connection (send_header also sets close_connection for this)
+        if self.close_connection or not self.server.can_keep_alive():
+            self.send_header("Connection", "close")
+        self.end_headers()
+
+    def _send(self, status, body, content_type="application/json", headers=None):
+        """Send a complete response; wfile is flushed once after the handler."""
+        self._send_headers(status, content_type, len(body), headers)
+        self.wfile.write(body)
 
-        if path == "/coverage":
-            self._handle_coverage(label)
-        elif path == "/health":
-            self._handle_health()
-        elif path == "/coverage/save":
-            self._handle_save()
-        elif path == "/coverage/reset":
-            self._handle_reset()
-        elif path == "/coverage/files":
-            self._handle_list_files()
+    def _send_coverage_json(self, envelope, json_bytes):
+        """Send `envelope` plus base64 `coverage_data` without building it in memory.
+
+        The base64 length is known up front, so Content-Length stays exact
+        while the data is encoded and written B64_CHUNK_SIZE bytes at a time.
+        """
+        prefix = json.dumps(envelope).encode()[:-1] + b',"coverage_data":"'
+        suffix = b'"}'
+        b64_length = 4 * ((len(json_bytes) + 2) // 3)
+
+        self._send_headers(200, "application/json", len(prefix) + b64_length + len(suffix))
+        self.wfile.write(prefix)
+        view = memoryview(json_bytes)
+        for offset in range(0, len(view), B64_CHUNK_SIZE):
+            self.wfile.write(base64.b64encode(view[offset:offset + B64_CHUNK_SIZE]))
+        self.wfile.write(suffix)
+
+    def handle_one_request(self):
+        self.connection.settimeout(self.timeout)
+        super().handle_one_request()
+
+    def do_GET(self):
+        self.connection.settimeout(self.send_timeout)
+        # Only /coverage takes query parameters, so just split them off here
+        path, _, self.query_string = self.path.partition("?")
+        if not path.startswith("/"):
+            # Absolute-form target (GET http://host:9095/coverage), as urlparse allowed
+            path = urllib.parse.urlsplit(path).path
+        self.response_started = False
+        handler = self._ROUTES.get(path)
+
+        if handler is None:
+            self._send(404, b"Not found", "text/plain")
         else:
-            self.send_response(404)
-            self.send_header("Content-Type", "text/plain")
-            self.end_headers()
-            self.wfile.write(b"Not found")
+            handler(self)
+
+    def _handle_coverage(self):
+        """Combine all coverage files and return them to the client.
 
-    def _handle_coverage(self, label):
-        """Combine all coverage files and return as JSON."""
-        print(f"{PRINT_PREFIX} Coverage dump requested (label={label})", flush=True)
+        Query parameters: `name` labels the dump (default "session");
+        files whose path contains any of the `exclude` substrings (comma
+        separated and/or repeated) are filtered out before serializing.
+
+        Clients sending ``Accept: application/octet-stream`` get the raw
+        CoverageData.dumps() bytes with the metadata in X-Coverage-* headers;
+        everyone else gets the base64-in-JSON payload CoverPort expects.
+        """
+        query = urllib.parse.parse_qs(self.query_string)
+        label = query.get("name", ["session"])[0]
+        exclude = [p for p in ",".join(query.get("exclude", [])).split(",") if p]
+
+        logger.debug("Coverage dump requested (label=%s)", label)
 
         try:
             # Find all coverage files in the data directory
-            pattern = os.path.join(COVERAGE_DATA_DIR, ".coverage*")
-            coverage_files = sorted(glob.glob(pattern))
+            coverage_files = find_coverage_files()
 
-            print(f"{PRINT_PREFIX} Found {len(coverage_files)} coverage file(s)", flush=True)
+            logger.debug("Found %d coverage file(s)", len(coverage_files))
+
+            if not coverage_files:
+                json_bytes = b""
+            else:
+                json_bytes = combine_coverage_files(coverage_files, exclude)
+
+            timestamp = utc_timestamp()
+
+            if "application/octet-stream" in self.headers.get("Accept", ""):
+                # Raw transport: no base64 inflation, no JSON envelope
+                self._send(200, json_bytes, "application/octet-stream", {
+                    "X-Coverage-Label": urllib.parse.quote(label),
+                    "X-Coverage-Timestamp": timestamp,
+                    "X-Coverage-Files-Combined": str(len(coverage_files)),
+                })
+                return
 
             if not coverage_files:
                 # Return empty coverage data
                 payload = {
                     "label": label,
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "timestamp": timestamp,
                     "coverage_data": "",
                     "files_combined": 0,
                     "message": "No coverage files found"
                 }
+                self._send(200, json.dumps(payload).encode())
             else:
-                # Create a combined coverage data object (in-memory, no writes)
-                combined = coverage.CoverageData(no_disk=True)
-
-                for cov_file in coverage_files:
-                    try:
-                        # Read each coverage file from disk (no_disk=False required for reading!)
-                        file_data = coverage.CoverageData(basename=cov_file)
-                        file_data.read()
-                        combined.update(file_data)
-                        measured = list(file_data.measured_files())
-                        print(f"{PRINT_PREFIX} Combined: {os.path.basename(cov_file)} ({len(measured)} files)", flush=True)
-                    except Exception as e:
-                        print(f"{PRINT_PREFIX} Error reading {cov_file}: {e}", flush=True)
-
-                # Serialize to binary and encode
-                json_bytes = combined.dumps()
-                json_b64 = base64.b64encode(json_bytes).decode('ascii')
-
-                payload = {
+                envelope = {
                     "label": label,
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                    "coverage_data": json_b64,
+                    "timestamp": timestamp,
                     "files_combined": len(coverage_files),
                 }
-
-            body = json.dumps(payload).encode()
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json")
-            self.send_header("Content-Length", str(len(body)))
-            self.end_headers()
-            self.wfile.write(body)
+                self._send_coverage_json(envelope, json_bytes)
 
         except Exception as e:
-            print(f"{PRINT_PREFIX} Error collecting coverage: {e}", flush=True)
-            self.send_response(500)
-            self.send_header("Content-Type", "text/plain")
-            self.end_headers()
-            self.wfile.write(f"Error: {e}".encode())
+            logger.error("Error collecting coverage: %s", e)
+            if self.response_started:
+                # The 200 status and part of the body are already out; a 500
+                # can't be sent now, so close and let the short body show it
+                self.close_connection = True
+            else:
+                self._send(500, f"Error: {e}".encode(), "text/plain")
 
     def _handle_health(self):
         """Return health status."""
-        print(f"{PRINT_PREFIX} Health check requested", flush=True)
+        logger.debug("Health check requested")
 
         # Count coverage files
-        pattern = os.path.join(COVERAGE_DATA_DIR, ".coverage*")
-        file_count = len(glob.glob(pattern))
+        file_count = len(find_coverage_files())
 
         payload = {
             "status": "ok",
@@ -149,13 +329,7 @@ class CoverageHandler(BaseHTTPRequestHandler):
             "data_dir": COVERAGE_DATA_DIR,
             "coverage_files": file_count,
         }
-        body = json.dumps(payload).encode()
-
-        self.send_response(200)
-        self.send_header("Content-Type", "application/json")
-        self.send_header("Content-Length", str(len(body)))
-        self.end_headers()
-        self.wfile.write(body)
+        self._send(200, json.dumps(payload).encode())
 
     def _handle_save(self):
         """Trigger coverage save by sending SIGHUP to PID 1 (Gunicorn master).
@@ -163,42 +337,33 @@ class CoverageHandler(BaseHTTPRequestHandler):
         This restarts Gunicorn workers, which triggers the worker_exit hook
         in gunicorn_coverage.py, saving each worker's coverage data to /dev/shm.
         """
-        import signal
-        import time
-
-        print(f"{PRINT_PREFIX} Coverage save triggered via /coverage/save", flush=True)
+        logger.info("Coverage save triggered via /coverage/save")
 
         try:
             os.kill(1, signal.SIGHUP)
             time.sleep(3)
 
-            pattern = os.path.join(COVERAGE_DATA_DIR, ".coverage*")
-            file_count = len(glob.glob(pattern))
-            print(f"{PRINT_PREFIX} After save: {file_count} coverage file(s) in {COVERAGE_DATA_DIR}", flush=True)
+            file_count = len(find_coverage_files())
+            logger.info("After save: %d coverage file(s) in %s", file_count, COVERAGE_DATA_DIR)
 
             payload = {
                 "status": "ok",
                 "message": "Coverage save triggered (SIGHUP sent to Gunicorn master)",
                 "coverage_files": file_count,
             }
-            self.send_response(200)
+            status = 200
         except Exception as e:
-            print(f"{PRINT_PREFIX} Error triggering save: {e}", flush=True)
+            logger.error("Error triggering save: %s", e)
             payload = {"status": "error", "message": str(e), "coverage_files": 0}
-            self.send_response(500)
+            status = 500
 
-        body = json.dumps(payload).encode()
-        self.send_header("Content-Type", "application/json")
-        self.send_header("Content-Length", str(len(body)))
-        self.end_headers()
-        self.wfile.write(body)
+        self._send(status, json.dumps(payload).encode())
 
     def _handle_reset(self):
         """Delete all coverage files."""
-        print(f"{PRINT_PREFIX} Coverage reset requested", flush=True)
+        logger.info("Coverage reset requested")
 
-        pattern = os.path.join(COVERAGE_DATA_DIR, ".coverage*")
-        files = glob.glob(pattern)
+        files = find_coverage_files()
         deleted = 0
 
         for f in files:
@@ -206,17 +371,13 @@ class CoverageHandler(BaseHTTPRequestHandler):
                 os.remove(f)
                 deleted += 1
             except Exception as e:
-                print(f"{PRINT_PREFIX} Error deleting {f}: {e}", flush=True)
+                logger.warning("Error deleting %s: %s", f, e)
 
-        self.send_response(200)
-        self.send_header("Content-Type", "text/plain")
-        self.end_headers()
-        self.wfile.write(f"Deleted {deleted} coverage files".encode())
+        self._send(200, f"Deleted {deleted} coverage files".encode(), "text/plain")
 
     def _handle_list_files(self):
         """List all coverage files (for debugging)."""
-        pattern = os.path.join(COVERAGE_DATA_DIR, ".coverage*")
-        files = sorted(glob.glob(pattern))
+        files = sorted(find_coverage_files())
 
         file_info = []
         for f in files:
@@ -234,51 +395,102 @@ class CoverageHandler(BaseHTTPRequestHandler):
             "data_dir": COVERAGE_DATA_DIR,
             "files": file_info
         }
-        body = json.dumps(payload, indent=2).encode()
-
-        self.send_response(200)
-        self.send_header("Content-Type", "application/json")
-        self.send_header("Content-Length", str(len(body)))
-        self.end_headers()
-        self.wfile.write(body)
+        self._send(200, json.dumps(payload, indent=2).encode())
+
+    _ROUTES = {
+        "/coverage": _handle_coverage,
+        "/health": _handle_health,
+        "/coverage/save": _handle_save,
+        "/coverage/reset": _handle_reset,
+        "/coverage/files": _handle_list_files,
+    }
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer that hands requests to a fixed pool of daemon threads.
+
+    Unlike ThreadingMixIn, a burst of scrapes doesn't spawn a thread per
+    request, and each new thread in the traced process doesn't get its own
+    coverage tracer installed.
+    """
+
+    request_queue_size = 64
+
+    def __init__(self, server_address, handler_class, pool_size):
+        super().__init__(server_address, handler_class)
+        self._requests = queue.Queue()
+        # Zero workers would accept connections and never answer them
+        self._pool_size = max(1, pool_size)
+        self._busy = 0
+        self._busy_lock = threading.Lock()
+        for i in range(self._pool_size):
+            threading.Thread(target=self._worker, name=f"coverage-http-{i}", daemon=True).start()
+
+    def process_request(self, request, client_address):
+        self._requests.put((request, client_address))
+
+    def can_keep_alive(self):
+        """True if holding the calling worker's connection open still leaves
+        another worker free for new connections (e.g. the liveness probe)."""
+        return self._requests.empty() and self._busy < self._pool_size
+
+    def _worker(self):
+        while True:
+            request, client_address = self._requests.get()
+            with self._busy_lock:
+                self._busy += 1
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                with self._busy_lock:
+                    self._busy -= 1
+                self.shutdown_request(request)
 
 
 def run_server():
     """Run the coverage HTTP server."""
-    class ThreadedHTTPServer(ThreadingMixIn, HTTPServer):
-        daemon_threads = True
-
-    server = ThreadedHTTPServer(("0.0.0.0", COVERAGE_PORT), CoverageHandler)
-    print(f"{PRINT_PREFIX} HTTP server listening on port {COVERAGE_PORT}", flush=True)
+    server = PooledHTTPServer(("0.0.0.0", COVERAGE_PORT), CoverageHandler, COVERAGE_HTTP_THREADS)
+    logger.info("HTTP server listening on port %d", COVERAGE_PORT)
     server.serve_forever()
 
 
+def setup_logging():
+    """Send wrapper logs to stdout without touching the app's root logger."""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter(f"{PRINT_PREFIX} %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(COVERAGE_LOG_LEVEL)
+    logger.propagate = False
+
+
 def setup_environment():
     """Set up environment variables for coverage collection."""
     # Set COVERAGE_PROCESS_START if not already set
     if not os.environ.get('COVERAGE_PROCESS_START'):
         if os.path.exists(DEFAULT_COVERAGERC):
             os.environ['COVERAGE_PROCESS_START'] = DEFAULT_COVERAGERC
-            print(f"{PRINT_PREFIX} Set COVERAGE_PROCESS_START={DEFAULT_COVERAGERC}", flush=True)
+            logger.info("Set COVERAGE_PROCESS_START=%s", DEFAULT_COVERAGERC)
         else:
-            print(f"{PRINT_PREFIX} WARNING: No .coveragerc found at {DEFAULT_COVERAGERC}", flush=True)
+            logger.warning("WARNING: No .coveragerc found at %s", DEFAULT_COVERAGERC)
     else:
-        print(f"{PRINT_PREFIX} Using COVERAGE_PROCESS_START={os.environ['COVERAGE_PROCESS_START']}", flush=True)
+        logger.info("Using COVERAGE_PROCESS_START=%s", os.environ['COVERAGE_PROCESS_START'])
 
     # Add the sitecustomize.py directory to PYTHONPATH
     sitecustomize_dir = SCRIPT_DIR
     pythonpath = os.environ.get('PYTHONPATH', '')
     if sitecustomize_dir not in pythonpath:
         os.environ['PYTHONPATH'] = f"{sitecustomize_dir}:{pythonpath}" if pythonpath else sitecustomize_dir
-        print(f"{PRINT_PREFIX} Added {sitecustomize_dir} to PYTHONPATH", flush=True)
+        logger.info("Added %s to PYTHONPATH", sitecustomize_dir)
 
     # Ensure coverage data directory exists and is writable
     if not os.path.exists(COVERAGE_DATA_DIR):
-        print(f"{PRINT_PREFIX} WARNING: Coverage data dir {COVERAGE_DATA_DIR} does not exist", flush=True)
+        logger.warning("WARNING: Coverage data dir %s does not exist", COVERAGE_DATA_DIR)
     elif not os.access(COVERAGE_DATA_DIR, os.W_OK):
-        print(f"{PRINT_PREFIX} WARNING: Coverage data dir {COVERAGE_DATA_DIR} is not writable", flush=True)
+        logger.warning("WARNING: Coverage data dir %s is not writable", COVERAGE_DATA_DIR)
     else:
-        print(f"{PRINT_PREFIX} Coverage data dir: {COVERAGE_DATA_DIR}", flush=True)
+        logger.info("Coverage data dir: %s", COVERAGE_DATA_DIR)
 
 
 def main():
@@ -296,13 +508,16 @@ def main():
         print(f"  python {sys.argv[0]} -m gunicorn -c gunicorn_coverage.py app:app")
         sys.exit(1)
 
-    # Set up environment for coverage collection
+    # Set up logging and environment for coverage collection
+    setup_logging()
     setup_environment()
 
     # Start HTTP server in background thread
-    server_thread = Thread(target=run_server, daemon=True)
+    server_thread = threading.Thread(target=run_server, daemon=True)
     server_thread.start()
 
+    import runpy
+
     # Prepare to run the target script
     script_args = sys.argv[1:]
 
@@ -310,13 +525,13 @@ def main():
     if script_args[0] == '-m' and len(script_args) > 1:
         module_name = script_args[1]
         sys.argv = [module_name] + script_args[2:]
-        print(f"{PRINT_PREFIX} Running module: {module_name}", flush=True)
+        logger.info("Running module: %s", module_name)
         runpy.run_module(module_name, run_name="__main__", alter_sys=True)
     else:
         # Run as script
         script_path = script_args[0]
         sys.argv = script_args
-        print(f"{PRINT_PREFIX} Running script: {script_path}", flush=True)
+        logger.info("Running script: %s", script_path)
 
         # Add script directory to path
         script_dir = os.path.dirname(os.path.abspath(script_path))
@@ -331,8 +546,8 @@ if __name__ == '__main__':
     try:
         main()
     except KeyboardInterrupt:
-        print(f"\n{PRINT_PREFIX} Shutting down...", flush=True)
+        logger.info("Shutting down...")
         sys.exit(0)
     except Exception as e:
-        print(f"{PRINT_PREFIX} Error: {e}", flush=True)
+        logger.error("Error: %s", e)
         raise
@@ -0,0 +1,467 @@
+"""
+Unit tests for the coverage HTTP server (server/coverage_server.py).
+
+These run locally against a coverage server bound to 127.0.0.1 and a
+temporary COVERAGE_DATA_DIR; no Kubernetes cluster is needed.
+"""
+
+import base64
+import http.client
+import json
+import os
+import random
+import re
+import sys
+import urllib.parse
+from datetime import datetime, timedelta, timezone
+from threading import Thread
+
+import coverage
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "server"))
+import coverage_server  # noqa: E402
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Point the server at an empty temporary coverage data directory."""
+    monkeypatch.setattr(coverage_server, "COVERAGE_DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(coverage_server, "_combined_cache", (None, b""))
+    return tmp_path
+
+
+@pytest.fixture
+def server(data_dir):
+    """Run a coverage server on an ephemeral port; yields the port."""
+    httpd = coverage_server.PooledHTTPServer(
+        ("127.0.0.1", 0), coverage_server.CoverageHandler, 2
+    )
+    Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def get(port, path, headers=None):
+    """GET `path` on a fresh connection; returns (response, body)."""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        conn.request("GET", path, headers=headers or {})
+        response = conn.getresponse()
+        return response, response.read()
+    finally:
+        conn.close()
+
+
+def write_lines_file(path, lines, context=None, tracers=None):
+    data = coverage.CoverageData(basename=str(path))
+    data.set_context(context)
+    data.add_lines(lines)
+    if tracers:
+        data.add_file_tracers(tracers)
+    data.write()
+
+
+def write_arcs_file(path, arcs):
+    data = coverage.CoverageData(basename=str(path))
+    data.add_arcs(arcs)
+    data.write()
+
+
+def load(json_bytes):
+    data = coverage.CoverageData(no_disk=True)
+    data.loads(json_bytes)
+    return data
+
+
+def test_utc_timestamp_format():
+    """ISO 8601 with microseconds and +00:00, within a second of datetime.now()."""
+    now = datetime.now(timezone.utc)
+    stamp = coverage_server.utc_timestamp()
+
+    assert re.fullmatch(r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d{6}\+00:00", stamp)
+    assert abs(datetime.fromisoformat(stamp) - now) < timedelta(seconds=1)
+
+
+def test_utc_timestamp_refreshes_cached_prefix(monkeypatch):
+    """The cached date/time prefix is rebuilt when the second changes."""
+    monkeypatch.setattr(coverage_server, "_timestamp_cache", (None, ""))
+    for ns in (1_700_000_000_250_000_000, 1_700_000_000_999_999_000, 1_700_000_001_000_001_000):
+        monkeypatch.setattr(coverage_server.time, "time_ns", lambda ns=ns: ns)
+        sec, micros = divmod(ns // 1000, 1_000_000)
+        expected = datetime.fromtimestamp(sec, timezone.utc) + timedelta(microseconds=micros)
+        assert datetime.fromisoformat(coverage_server.utc_timestamp()) == expected
+
+
+def test_exclude_drops_files_and_keeps_lines(data_dir):
+    """Excluded files are gone; kept lines, contexts and tracers are unchanged."""
+    write_lines_file(
+        data_dir / ".coverage.a",
+        {
+            "/app/app.py": [1, 2],
+            "/app/templates/index.html": [4],
+            "/venv/site-packages/flask/app.py": [5],
+        },
+        context="test_index",
+        tracers={"/app/templates/index.html": "django.DjangoTemplatePlugin"},
+    )
+    write_lines_file(
+        data_dir / ".coverage.b",
+        {"/app/app.py": [3], "/opt/coverage_server.py": [9]},
+        context="test_status",
+    )
+    files = coverage_server.find_coverage_files()
+
+    data = load(coverage_server.combine_coverage_files(
+        files, ["site-packages", "coverage_server.py"]
+    ))
+
+    assert data.measured_files() == {"/app/app.py", "/app/templates/index.html"}
+    assert sorted(data.lines("/app/app.py")) == [1, 2, 3]
+    assert data.lines("/app/templates/index.html") == [4]
+    assert data.file_tracer("/app/templates/index.html") == "django.DjangoTemplatePlugin"
+    assert data.file_tracer("/app/app.py") == ""
+    assert data.measured_contexts() == {"test_index", "test_status"}
+    assert data.contexts_by_lineno("/app/app.py") == {
+        1: ["test_index"], 2: ["test_index"], 3: ["test_status"],
+    }
+
+
+def test_exclude_keeps_arcs(data_dir):
+    """Arc (branch) data survives filtering unchanged."""
+    arcs = [(-1, 1), (1, 2), (2, -1)]
+    write_arcs_file(
+        data_dir / ".coverage.a",
+        {"/app/app.py": arcs, "/venv/site-packages/x.py": [(-1, 7)]},
+    )
+
+    data = load(coverage_server.combine_coverage_files(
+        coverage_server.find_coverage_files(), ["site-packages"]
+    ))
+
+    assert data.has_arcs()
+    assert data.measured_files() == {"/app/app.py"}
+    assert sorted(data.arcs("/app/app.py")) == sorted(arcs)
+
+
+def test_exclude_everything_keeps_arc_mode(data_dir):
+    """Excluding every file still yields (empty) arc data, not line data."""
+    write_arcs_file(data_dir / ".coverage.a", {"/venv/site-packages/x.py": [(-1, 7)]})
+
+    data = load(coverage_server.combine_coverage_files(
+        coverage_server.find_coverage_files(), ["site-packages"]
+    ))
+
+    assert data.measured_files() == set()
+    assert data.has_arcs()
+
+
+def test_exclude_matching_nothing_returns_data_unchanged():
+    """With no file excluded the data is returned as is, without copying."""
+    data = coverage.CoverageData(no_disk=True)
+    data.set_context("test_a")
+    data.add_lines({"/app/app.py": [1, 2]})
+
+    assert coverage_server.filter_coverage_data(data, ["site-packages"]) is data
+
+
+def test_exclude_keeps_files_without_data(data_dir):
+    """Measured-but-empty files stay listed after filtering."""
+    write_lines_file(data_dir / ".coverage.a", {"/app/app.py": [1], "/app/empty.py": []})
+
+    data = load(coverage_server.combine_coverage_files(
+        coverage_server.find_coverage_files(), ["site-packages"]
+    ))
+
+    assert data.measured_files() == {"/app/app.py", "/app/empty.py"}
+
+
+def test_coverage_endpoint_accepts_repeated_exclude(server, data_dir):
+    """Repeated and comma-separated exclude parameters are combined."""
+    write_lines_file(
+        data_dir / ".coverage.a",
+        {"/app/app.py": [1], "/venv/site-packages/x.py": [2], "/opt/coverage_server.py": [3]},
+    )
+
+    response, body = get(
+        server, "/coverage?name=t&exclude=site-packages&exclude=coverage_server.py"
+    )
+
+    assert response.status == 200
+    payload = json.loads(body)
+    data = load(base64.b64decode(payload["coverage_data"]))
+    assert data.measured_files() == {"/app/app.py"}
+
+
+def test_octet_stream_returns_raw_dump(server, data_dir):
+    """Accept: application/octet-stream gets the dumps() bytes and X-Coverage-* headers."""
+    write_lines_file(data_dir / ".coverage.a", {"/app/app.py": [1, 2]}, context="test_a")
+    write_lines_file(data_dir / ".coverage.b", {"/app/app.py": [3]})
+
+    response, body = get(
+        server, "/coverage?name=run%201%2F%C3%A9",
+        {"Accept": "application/octet-stream"},
+    )
+
+    assert response.status == 200
+    assert response.getheader("Content-Type") == "application/octet-stream"
+    assert response.getheader("X-Coverage-Label") == "run%201/%C3%A9"
+    assert urllib.parse.unquote(response.getheader("X-Coverage-Label")) == "run 1/é"
+    assert response.getheader("X-Coverage-Files-Combined") == "2"
+    assert response.getheader("X-Coverage-Timestamp")
+    data = load(body)
+    assert sorted(data.lines("/app/app.py")) == [1, 2, 3]
+    assert data.measured_contexts() == {"", "test_a"}
+
+
+def test_octet_stream_without_files_is_empty(server, data_dir):
+    """With no coverage files the raw response has an empty body."""
+    response, body = get(server, "/coverage", {"Accept": "application/octet-stream"})
+
+    assert response.status == 200
+    assert body == b""
+    assert response.getheader("Content-Length") == "0"
+    assert response.getheader("X-Coverage-Label") == "session"
+    assert response.getheader("X-Coverage-Files-Combined") == "0"
+
+
+@pytest.mark.parametrize("target, status", [
+    ("/health", 200),
+    ("/health?x=1", 200),
+    ("/coverage/files?verbose", 200),
+    ("/health/", 404),
+    ("/nope?name=x", 404),
+    ("/", 404),
+])
+def test_routing(server, target, status):
+    """The query string is split off before the route lookup."""
+    response, _ = get(server, target)
+
+    assert response.status == status
+
+
+def test_routing_accepts_absolute_form_target(server):
+    """A proxy-style absolute URL still routes by its path and query."""
+    response, body = get(server, f"http://127.0.0.1:{server}/coverage?name=abs")
+
+    assert response.status == 200
+    assert json.loads(body)["label"] == "abs"
+
+
+def test_failed_read_is_not_cached(data_dir, monkeypatch):
+    """A combine that skipped an unreadable file is retried on the next scrape."""
+    write_lines_file(data_dir / ".coverage.a", {"/app/a.py": [1]})
+    write_lines_file(data_dir / ".coverage.b", {"/app/b.py": [2]})
+    files = coverage_server.find_coverage_files()
+
+    real_read = coverage.CoverageData.read
+    def locked_read(self):
+        if self.base_filename().endswith(".coverage.b"):
+            raise coverage.CoverageException("database is locked")
+        real_read(self)
+    monkeypatch.setattr(coverage.CoverageData, "read", locked_read)
+    assert load(coverage_server.combine_coverage_files(files)).measured_files() == {"/app/a.py"}
+
+    monkeypatch.setattr(coverage.CoverageData, "read", real_read)
+    assert load(coverage_server.combine_coverage_files(files)).measured_files() == {
+        "/app/a.py", "/app/b.py",
+    }
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """Record the basename of every CoverageData.read() call."""
+    calls = []
+    real_read = coverage.CoverageData.read
+    def counting_read(self):
+        calls.append(os.path.basename(self.base_filename()))
+        real_read(self)
+    monkeypatch.setattr(coverage.CoverageData, "read", counting_read)
+    return calls
+
+
+def test_unchanged_files_reuse_cached_combine(data_dir, reads):
+    """A second scrape of unchanged files returns the cached bytes without reading."""
+    write_lines_file(data_dir / ".coverage.a", {"/app/a.py": [1]})
+    write_lines_file(data_dir / ".coverage.b", {"/app/b.py": [2]})
+
+    reads.clear()
+    first = coverage_server.combine_coverage_files(coverage_server.find_coverage_files())
+    assert set(reads) == {".coverage.a", ".coverage.b"}
+    reads.clear()
+
+    second = coverage_server.combine_coverage_files(coverage_server.find_coverage_files())
+    assert second is first
+    assert reads == []
+
+
+def test_cache_is_invalidated_when_files_change(data_dir, reads):
+    """Adding, rewriting or removing a data file forces a fresh combine."""
+    def combine():
+        reads.clear()
+        files = coverage_server.find_coverage_files()
+        return load(coverage_server.combine_coverage_files(files)).measured_files()
+
+    write_lines_file(data_dir / ".coverage.a", {"/app/a.py": [1]})
+    assert combine() == {"/app/a.py"}
+
+    write_lines_file(data_dir / ".coverage.b", {"/app/b.py": [2]})
+    assert combine() == {"/app/a.py", "/app/b.py"}
+    assert set(reads) == {".coverage.a", ".coverage.b"}
+
+    write_lines_file(data_dir / ".coverage.a", {"/app/c.py": list(range(1, 50))})
+    stat = os.stat(data_dir / ".coverage.a")
+    os.utime(data_dir / ".coverage.a", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert combine() == {"/app/b.py", "/app/c.py"}
+    assert set(reads) == {".coverage.a", ".coverage.b"}
+
+    os.remove(data_dir / ".coverage.b")
+    assert combine() == {"/app/c.py"}
+    assert set(reads) == {".coverage.a"}
+
+
+def test_pool_size_below_one_still_serves(data_dir):
+    """COVERAGE_HTTP_THREADS=0 must not leave accepted requests unanswered."""
+    httpd = coverage_server.PooledHTTPServer(
+        ("127.0.0.1", 0), coverage_server.CoverageHandler, 0
+    )
+    Thread(target=httpd.serve_forever, daemon=True).start()
+    try:
+        response, _ = get(httpd.server_address[1], "/health")
+        assert response.status == 200
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+@pytest.mark.parametrize("size", [
+    0, 1, coverage_server.B64_CHUNK_SIZE, coverage_server.B64_CHUNK_SIZE + 1,
+])
+def test_streamed_json_matches_content_length(server, data_dir, monkeypatch, size):
+    """The hand-built JSON body is valid, exactly Content-Length long, and lossless."""
+    dump = bytes(range(256)) * (size // 256 + 1)
+    dump = dump[:size]
+    write_lines_file(data_dir / ".coverage.a", {"/app/app.py": [1]})
+    monkeypatch.setattr(coverage_server, "combine_coverage_files", lambda files, exclude: dump)
+
+    response, body = get(server, '/coverage?name=quote%22and%C3%A9')
+
+    assert response.status == 200
+    assert len(body) == int(response.getheader("Content-Length"))
+    payload = json.loads(body)
+    assert payload["label"] == 'quote"andé'
+    assert payload["files_combined"] == 1
+    assert base64.b64decode(payload["coverage_data"]) == dump
+
+
+def test_streamed_json_matches_dumps(server, data_dir):
+    """The JSON path round-trips the real CoverageData.dumps() output."""
+    rng = random.Random(1)
+    write_lines_file(data_dir / ".coverage.a", {
+        f"/app/pkg{i}/mod_{rng.getrandbits(64):x}.py": rng.sample(range(1, 2000), 200)
+        for i in range(500)
+    })
+    expected = coverage_server.combine_coverage_files(coverage_server.find_coverage_files())
+    assert len(expected) > coverage_server.B64_CHUNK_SIZE
+
+    response, body = get(server, "/coverage")
+
+    assert len(body) == int(response.getheader("Content-Length"))
+    assert base64.b64decode(json.loads(body)["coverage_data"]) == expected
+
+
+def test_error_mid_stream_closes_instead_of_sending_500(server, data_dir, monkeypatch):
+    """A failure after the 200 headers must not splice a second status line."""
+    write_lines_file(data_dir / ".coverage.a", {"/app/app.py": [1]})
+    dump = b"x" * (coverage_server.B64_CHUNK_SIZE * 6)
+    monkeypatch.setattr(coverage_server, "combine_coverage_files", lambda files, exclude: dump)
+
+    real_b64encode = base64.b64encode
+    calls = []
+    def failing_b64encode(block):
+        calls.append(block)
+        if len(calls) == 5:
+            raise RuntimeError("boom")
+        return real_b64encode(block)
+    monkeypatch.setattr(coverage_server.base64, "b64encode", failing_b64encode)
+
+    conn = http.client.HTTPConnection("127.0.0.1", server, timeout=5)
+    conn.request("GET", "/coverage")
+    response = conn.getresponse()
+    assert response.status == 200
+    with pytest.raises(http.client.IncompleteRead) as excinfo:
+        response.read()
+    assert b"HTTP/1.1 500" not in excinfo.value.partial
+    conn.close()
+
+
+
+def test_health_answers_with_idle_keep_alive_connections(data_dir):
+    """Idle keep-alive connections must not starve the liveness probe."""
+    pool_size = coverage_server.COVERAGE_HTTP_THREADS
+    httpd = coverage_server.PooledHTTPServer(
+        ("127.0.0.1", 0), coverage_server.CoverageHandler, pool_size
+    )
+    Thread(target=httpd.serve_forever, daemon=True).start()
+    port = httpd.server_address[1]
+    idle = []
+    try:
+        for _ in range(pool_size):
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            conn.request("GET", "/health")
+            response = conn.getresponse()
+            response.read()
+            idle.append((conn, response))
+
+        # Every connection but the one that took the last free worker stays open
+        for conn, response in idle[:-1]:
+            assert response.getheader("Connection") is None
+        assert idle[-1][1].getheader("Connection") == "close"
+
+        response, _ = get(port, "/health")
+        assert response.status == 200
+    finally:
+        for conn, _ in idle:
+            conn.close()
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_connection_close_is_announced(data_dir):
+    """A response on a connection the server will drop carries Connection: close."""
+    httpd = coverage_server.PooledHTTPServer(
+        ("127.0.0.1", 0), coverage_server.CoverageHandler, 1
+    )
+    Thread(target=httpd.serve_forever, daemon=True).start()
+    conn = http.client.HTTPConnection("127.0.0.1", httpd.server_address[1], timeout=5)
+    try:
+        for _ in range(2):
+            conn.request("GET", "/health")
+            response = conn.getresponse()
+            response.read()
+            assert response.status == 200
+            assert response.getheader("Connection") == "close"
+    finally:
+        conn.close()
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_keep_alive_connection_is_reused(server):
+    """With a spare worker the connection stays open across requests."""
+    conn = http.client.HTTPConnection("127.0.0.1", server, timeout=5)
+    try:
+        conn.request("GET", "/health")
+        first = conn.getresponse()
+        first.read()
+        sock = conn.sock
+        conn.request("GET", "/coverage/files")
+        second = conn.getresponse()
+        second.read()
+
+        assert first.getheader("Connection") is None
+        assert second.status == 200
+        assert conn.sock is sock
+    finally:
+        conn.close()
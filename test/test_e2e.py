@@ -16,17 +16,25 @@ import pytest
 APP_URL = "http://localhost:8080"
 
 
-def test_index_endpoint():
+@pytest.fixture(scope="session")
+def http_session():
+    """Shared HTTP session so all tests reuse pooled connections to the app."""
+    session = requests.Session()
+    yield session
+    session.close()
+
+
+def test_index_endpoint(http_session):
     """Test the index endpoint."""
-    response = requests.get(f"{APP_URL}/")
+    response = http_session.get(f"{APP_URL}/")
     assert response.status_code == 200
     assert "Hello" in response.text
     print(f"[test] Index endpoint returned: {response.text}")
 
 
-def test_status_endpoint():
+def test_status_endpoint(http_session):
     """Test the status endpoint."""
-    response = requests.get(f"{APP_URL}/status")
+    response = http_session.get(f"{APP_URL}/status")
     assert response.status_code == 200
     data = response.json()
     assert data.get("status") == "ok"